@@ -8,11 +8,28 @@
 
 import random
 import time
+import math
 import csv
+import json
 import argparse
+import itertools
+import queue
+import socket
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import redirect_stdout
 from subprocess import call
 from os import name
 from os import mkdir
+from os import makedirs
+from os import replace
+from os import remove
+from os.path import exists
+from multiprocessing import cpu_count
+from multiprocessing import get_all_start_methods
+from multiprocessing import get_context
+from multiprocessing.connection import wait
 from shutil import get_terminal_size
 
 term_colors = {
@@ -25,16 +42,115 @@ term_colors = {
     "white": "37",
 }
 
+# columns of the csv output written by the model
+csv_header = ("gauss", "crossingnum", "alexander", "knottype")
+# additional columns holding the analysis status and braids which were not analyzed
+status_header = ("status", "braid")
+# additional columns identifying each run of a sweep
+sweep_header = ("configuration", "loops", "moves", "k_right", "k_above", "run", "seed")
+
+# prime knots (up to 7 crossings) identified by their normalized alexander polynomial coefficients
+# the position of each knot type is the knot type id saved in columnar data
+knot_types = (
+    "0_1",
+    "3_1",
+    "4_1",
+    "5_1",
+    "5_2",
+    "6_1",
+    "6_2",
+    "6_3",
+    "7_1",
+    "7_2",
+    "7_3",
+    "7_4",
+    "7_5",
+    "7_6",
+    "7_7",
+)
+alexander_table = {
+    (1,): 0,
+    (1, -1, 1): 1,
+    (1, -3, 1): 2,
+    (1, -1, 1, -1, 1): 3,
+    (2, -3, 2): 4,
+    (2, -5, 2): 5,
+    (1, -3, 3, -3, 1): 6,
+    (1, -3, 5, -3, 1): 7,
+    (1, -1, 1, -1, 1, -1, 1): 8,
+    (3, -5, 3): 9,
+    (2, -3, 3, -3, 2): 10,
+    (4, -7, 4): 11,
+    (2, -4, 5, -4, 2): 12,
+    (1, -5, 7, -5, 1): 13,
+    (1, -5, 9, -5, 1): 14,
+}
+# knot type id of polynomials missing from the table (composite knots or more than 7 crossings)
+unknown_knot = -1
+
+# fixed-width columns of the columnar output and their numpy dtypes
+columnar_columns = (
+    ("run", "<i8"),
+    ("seed", "<i8"),
+    ("configuration", "<i4"),
+    ("loops", "<i4"),
+    ("moves", "<i4"),
+    ("k_right", "<f8"),
+    ("k_above", "<f8"),
+    ("crossingnum", "<i4"),
+    ("alexander", "<i4"),
+    ("knottype", "<i4"),
+    ("status", "<i4"),
+    ("weight", "<f8"),
+    ("inactive", "<i8"),
+)
+# categorical columns hold integer ids into a dictionary stored in meta.json
+columnar_categories = ("configuration", "alexander", "status")
+# variable-length columns are packed into one byte column with an offsets column
+columnar_packed = ("gauss", "braid")
+
+
+class Viewport:
+    """Window of the terminal in which braids and knots are displayed.
+
+    Only the columns inside the window are displayed and it pans horizontally to follow the active end,
+    so wide coils don't wrap around the terminal.
+    """
 
-def braid_step(prev_state, k_right=0.5, k_above=0.5, quiet=False, color=False):
-    """Given the previous braid step (forward component) as a string, generate the next braid step.
+    def __init__(self, columns=None, lines=None):
+        """Keyword arguments:
+        columns -- width of the window (default None, width of the terminal)
+        lines -- height of the window (default None, height of the terminal)
+        """
+
+        size = get_terminal_size()
+        self.columns = columns or size.columns
+        self.lines = lines or size.lines
+        # first column inside the window
+        self.offset = 0
+
+    def follow(self, end, width):
+        """Pan the window if the active end (at column end of a row of given width) is close to its edges."""
+
+        if width <= self.columns:
+            self.offset = 0
+            return
+        margin = self.columns // 4
+        if end < self.offset + margin or end >= self.offset + self.columns - margin:
+            # recenter on the active end
+            self.offset = min(max(end - self.columns // 2, 0), width - self.columns)
+
+    def crop(self, row):
+        """Return the part of a row inside the window."""
+
+        return row[self.offset : self.offset + self.columns]
+
+
+def forced_direction(prev_state):
+    """Return the only direction (True for right, False for left) the active end can move in, or None if it can move either way.
 
     Keyword arguments:
     prev_state -- previous braid step (forward component) as a string
-    k_right -- probability of active end moving to the right (default 0.5)
-    k_above -- probability of active end moving over an adjacent loop (default 0.5)
-    quiet -- suppress output (default False)
-    color -- color active end in terminal with one of black, red, green, yellow, blue, magenta, cyan or white (default False)
     """
 
     # find the mobile end of the string
@@ -44,25 +160,33 @@ def braid_step(prev_state, k_right=0.5, k_above=0.5, quiet=False, color=False):
     # it's at left boundary
     if end == 0:
         # can only go right
-        right = True
+        return True
     # it's at right boundary
     elif end == len(prev_state) - 1:
         # can only go left
-        right = False
+        return False
     # check if there are interactable strands on the left
     elif "│" not in prev_state[1:end]:
         # can only go right
-        right = True
+        return True
     elif "│" not in prev_state[end:]:
         # can only go left
-        right = False
+        return False
     # otherwise there will be strands on either side
-    else:
-        # decide direction
-        right = random.random() <= k_right
+    return None
 
-    # decide above/below
-    above = random.random() <= k_above
+
+def braid_move(prev_state, right, above):
+    """Construct the braid move (cross and forward step) for a chosen direction and crossing.
+
+    Keyword arguments:
+    prev_state -- previous braid step (forward component) as a string
+    right -- move the active end to the right (True) or left (False)
+    above -- cross above (True) or below (False) the adjacent loop
+    """
+
+    # find the mobile end of the string
+    end = prev_state.index("┃")
 
     # construct braid move (two lines)
     # first copy previous
@@ -107,25 +231,54 @@ def braid_step(prev_state, k_right=0.5, k_above=0.5, quiet=False, color=False):
     else:
         step[target - 1] = "┃"
 
+    return ("".join(cross), "".join(step))
+
+
+def braid_step(
+    prev_state, k_right=0.5, k_above=0.5, quiet=False, color=False, viewport=None
+):
+    """Given the previous braid step (forward component) as a string, generate the next braid step.
+
+    Keyword arguments:
+    prev_state -- previous braid step (forward component) as a string
+    k_right -- probability of active end moving to the right (default 0.5)
+    k_above -- probability of active end moving over an adjacent loop (default 0.5)
+    quiet -- suppress output (default False)
+    color -- color active end in terminal with one of black, red, green, yellow, blue, magenta, cyan or white (default False)
+    viewport -- Viewport in which to display the braid step (default None, display the whole rows)
+    """
+
+    # decide direction unless the end is limited by a boundary
+    right = forced_direction(prev_state)
+    if right is None:
+        right = random.random() <= k_right
+
+    # decide above/below
+    above = random.random() <= k_above
+
+    cross, step = braid_move(prev_state, right, above)
+
     # check if output should not be displayed
     if not quiet:
+        c_cross = cross
+        c_step = step
+        # only format the part of the rows inside the viewport
+        if viewport:
+            viewport.follow(step.index("┃"), len(step))
+            c_cross = viewport.crop(c_cross)
+            c_step = viewport.crop(c_step)
         # color mobile end
         if color in term_colors:
-            c_cross = "".join(cross)
             for char in ["┗", "┓", "┛", "┏", "━"]:
                 c_cross = c_cross.replace(
                     char, "\033[" + term_colors[color] + "m" + char + "\033[0m"
                 )
-            c_step = "".join(step)
             c_step = c_step.replace(
                 "┃", "\033[" + term_colors[color] + "m┃" + "\033[0m"
             )
-            print(c_cross)
-            print(c_step)
-        else:
-            print("".join(cross))
-            print("".join(step))
-    return ("".join(cross), "".join(step))
+        print(c_cross)
+        print(c_step)
+    return (cross, step)
 
 
 def t_steps(
@@ -137,6 +290,7 @@ def t_steps(
     color=False,
     sleep=False,
     path=False,
+    viewport=None,
 ):
     """Take t braid steps from initial state.
 
@@ -148,6 +302,7 @@ def t_steps(
     color -- color active end in terminal with one of black, red, green, yellow, blue, magenta, cyan or white (default False)
     sleep -- time in seconds to delay between displaying each braid step (default False)
     path -- file in which you want to save the output braid (default False)
+    viewport -- Viewport in which to display the braid, only the last rows fitting in it are displayed unless there is a delay (default None)
     """
 
     # empty list to store output
@@ -158,16 +313,24 @@ def t_steps(
     if "┃" not in init_state:
         # add the rows we know are present already
         for row in init_state:
-            if not quiet:
-                print(row)
             out_list.append(row)
         prev_state = init_state[-1]
     # otherwise, just need the standard raymer row
     else:
-        print(init_state)
         out_list.append(init_state)
         prev_state = init_state
 
+    # without a delay, rows which scroll out of the viewport are never seen so they aren't displayed
+    first_shown = 0
+    if viewport and not sleep:
+        first_shown = max(t - viewport.lines // 2, 0)
+
+    if not quiet and first_shown == 0:
+        if viewport:
+            viewport.follow(prev_state.index("┃"), len(prev_state))
+        for row in out_list:
+            print(viewport.crop(row) if viewport else row)
+
     # if you want to save the data, path should hold name the output file
     if path:
         with open(path, "w") as f:
@@ -176,7 +339,12 @@ def t_steps(
                 f.write(row + "\n")
             for i in range(t):
                 cross, prev_state = braid_step(
-                    prev_state, k_right, k_above, quiet, color
+                    prev_state,
+                    k_right,
+                    k_above,
+                    quiet or i < first_shown,
+                    color,
+                    viewport,
                 )
                 f.write(cross + "\n")
                 f.write(prev_state + "\n")
@@ -188,7 +356,9 @@ def t_steps(
                     time.sleep(sleep)
     else:
         for i in range(t):
-            cross, prev_state = braid_step(prev_state, k_right, k_above, quiet, color)
+            cross, prev_state = braid_step(
+                prev_state, k_right, k_above, quiet or i < first_shown, color, viewport
+            )
             # write to list
             out_list.append(cross)
             out_list.append(prev_state)
@@ -198,6 +368,54 @@ def t_steps(
     return tuple(out_list)
 
 
+def braid_decisions(braid, start):
+    """Recover the decisions made at each braid step of a generated braid.
+
+    Yields (forced, right, above) for each step where forced is the direction the active end was limited to
+    (see forced_direction), right is True if it moved right and above is True if it crossed above the loop.
+
+    Keyword arguments:
+    braid -- tuple or list containing all rows of a generated braid
+    start -- number of rows of the initial configuration
+    """
+
+    for i in range(start - 1, len(braid) - 2, 2):
+        prev_state = braid[i]
+        cross = braid[i + 1]
+        end = prev_state.index("┃")
+        right = "┗" in cross
+        # find the loop the active end moved around
+        if right:
+            target = end + prev_state[end:].index("│")
+        else:
+            target = end - prev_state[:end][::-1].index("│") - 1
+        # the loop is only covered if the active end crossed above it
+        above = cross[target] == "━"
+        yield (forced_direction(prev_state), right, above)
+
+
+def braid_log_likelihood(braid, start, k_right=0.5, k_above=0.5):
+    """Return the natural log of the probability of generating a braid (-inf if it is impossible).
+
+    Keyword arguments:
+    braid -- tuple or list containing all rows of a generated braid
+    start -- number of rows of the initial configuration
+    k_right -- probability of active end moving to the right (default 0.5)
+    k_above -- probability of active end moving over an adjacent loop (default 0.5)
+    """
+
+    log_likelihood = 0.0
+    for forced, right, above in braid_decisions(braid, start):
+        p = k_above if above else 1 - k_above
+        if forced is None:
+            p *= k_right if right else 1 - k_right
+        if p <= 0:
+            return -math.inf
+        log_likelihood += math.log(p)
+
+    return log_likelihood
+
+
 def generate_blank(loops, non_interacting=False):
     """Generate row of desired width with only loops and spaces.
 
@@ -375,12 +593,80 @@ def generate_twist(loops, non_interacting=False):
     )
 
 
-def draw_knot(state, quiet=False):
+def sample_inactive(runs, loops, inactive, rng):
+    """Select random non-interacting loops for a batch of runs at once.
+
+    Returns a boolean array with one row per run and one column per loop (from left) which is True for non-interacting loops.
+
+    Keyword arguments:
+    runs -- number of runs in the batch
+    loops -- number of loops in the coil
+    inactive -- number of non-interacting loops in each run
+    rng -- numpy random generator
+    """
+
+    import numpy
+
+    # the first loops of a random permutation of each row are non-interacting
+    order = numpy.argsort(rng.random((runs, loops)), axis=1)
+    mask = numpy.zeros((runs, loops), dtype=bool)
+    numpy.put_along_axis(mask, order[:, :inactive], True, axis=1)
+
+    return mask
+
+
+def apply_inactive(init_config, mask):
+    """Return a copy of an initial configuration generated without non-interacting loops where the loops in mask are non-interacting.
+
+    Keyword arguments:
+    init_config -- initial starting configuration of braid (all rows)
+    mask -- one boolean for each loop (from left), True for non-interacting loops
+    """
+
+    columns = [2 * i + 1 for i, masked in enumerate(mask) if masked]
+    # if ┃ isn't present in the first layer of the init state, we can assume there are multiple rows
+    single = "┃" in init_config
+    rows = []
+    for row in (init_config,) if single else init_config:
+        row = list(row)
+        # crossings of the active end over the loops are left in place
+        for column in columns:
+            if row[column] == "│":
+                row[column] = "┆"
+        rows.append("".join(row))
+
+    return rows[0] if single else tuple(rows)
+
+
+def inactive_mask(init_config):
+    """Return the non-interacting loops of an initial configuration as an integer bitmask (bit i for loop i + 1 from left).
+
+    Keyword arguments:
+    init_config -- initial starting configuration of braid (all rows)
+    """
+
+    # the last row of the initial configuration shows every loop
+    row = init_config if "┃" in init_config else init_config[-1]
+    return sum(1 << i for i, column in enumerate(row[1::2]) if column == "┆")
+
+
+# generator of each initial configuration
+configurations = {
+    "raymer": generate_raymer,
+    "peppino": generate_peppino,
+    "twist": generate_twist,
+}
+# braids generated from seeds share the random module
+generation_lock = threading.Lock()
+
+
+def draw_knot(state, quiet=False, viewport=None):
     """Draw a full 2D representation of the braid as a knot.
     
     Keyword arguments:
     state -- string of single initial state or tuple or list containing many rows of an initial state or a fully generated braid
     quiet -- suppress output (default False)
+    viewport -- Viewport in which to display the bottom of the knot (default None, display the whole knot)
     """
 
     # create an empty list to store the whole knot
@@ -476,7 +762,16 @@ def draw_knot(state, quiet=False):
         knot_str += "".join(row) + "\n"
     # print output
     if not quiet:
-        print(knot_str)
+        if viewport:
+            rows = knot_str.split("\n")[-viewport.lines :]
+            # follow the tail of the active end
+            for row in reversed(rows):
+                if "┃" in row:
+                    viewport.follow(row.index("┃"), len(row))
+                    break
+            print("\n".join(viewport.crop(row) for row in rows))
+        else:
+            print(knot_str)
     return knot_str
 
 
@@ -569,6 +864,8 @@ def knot_to_coords(knot):
 
 def analyze_coords(coords, path=False, quiet=False):
     """Use pyknotid to analyze generated knot coordinates.
+
+    Returns the gauss code, crossing number, alexander polynomial, knot type and normalized alexander polynomial coefficients.
     
     Keyword arguments:
     coords -- list of coordinates in the form [x,y,z]
@@ -600,245 +897,2096 @@ def analyze_coords(coords, path=False, quiet=False):
     crossing_num = len(gauss_code)
 
     # alexander polynomial
-    alexander_poly = str(k.alexander_polynomial(variable=sympy.Symbol("t")))
-
-    results = (str(gauss_code), crossing_num, alexander_poly)
+    t = sympy.Symbol("t")
+    alexander = k.alexander_polynomial(variable=t)
+    alexander_poly = str(alexander)
+
+    # knot type from the normalized coefficients, which are returned so they don't have to be parsed again
+    coeffs = alexander_coefficients(alexander, t)
+    knot_type = classify_alexander(coeffs)
+
+    results = (
+        str(gauss_code),
+        crossing_num,
+        alexander_poly,
+        knot_type_name(knot_type),
+        coeffs,
+    )
 
     if not quiet:
         print(f"Crossing number: {crossing_num}")
         print(f"Gauss code: {str(gauss_code)}")
         print(f"Alexander polynomial: {alexander_poly}")
+        print(f"Knot type: {knot_type_name(knot_type)}")
 
     # to save the data, path should hold name the output file
     if path:
         with open(path, "a") as csvfile:
             writer = csv.writer(csvfile)
-            writer.writerow(results)
+            writer.writerow(results[: len(csv_header)])
 
     return results
 
 
-def write_header(path):
-    """Initialize csv file with appropriate header for knot data."""
-
-    # warning, will overwrite the file if it already exists
-    with open(path, "w") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(("gauss", "crossingnum", "alexander"))
+def diagram_crossings(coords):
+    """Count the loops crossed by the active end in the knot diagram (before any simplification) from its coordinates."""
 
-    return
+    # points where the active end passes over or under something are lifted out of the plane,
+    # but only those in odd columns are loops, the rest are gaps between them
+    return sum(1 for coord in coords if coord[2] != 0 and int(coord[0]) % 2 == 1)
 
 
-def run_model(
-    runs,
-    t,
-    init_config,
-    k_right=0.5,
-    k_above=0.5,
-    quiet=False,
-    color="random",
-    sleep=False,
-    save_braids=False,
-    path=False,
-):
-    """Run multiple tumbling models and optionally save the data.
+def analyze_braid(braid, path=False, quiet=False):
+    """Close a braid into a knot and analyze it (see analyze_coords).
 
     Keyword arguments:
-    init_state -- initial starting configuration of braid (all rows)
-    k_right -- probability of active end moving to the right (default 0.5)
-    k_above -- probability of active end moving over an adjacent loop (default 0.5)
+    braid -- tuple or list containing all rows of a generated braid
+    path -- path to csv in which gauss_code, crossing number, alexander polynomial and knot type will be appended (default False)
     quiet -- suppress output (default False)
-    color -- color active end in terminal with one of red, green, yellow, blue, magenta, cyan or white
-             if random, each run will display with a random color from those listed above (default random)
-    sleep -- time in seconds to delay between displaying each braid step (default False)
-    save_braids -- boolean to save each braid as a textfile in a subdirectory with the same name as the csv in path (default False)
-    path -- csv file in which you want to save the output analysis data (default False)
     """
 
-    # record start time
-    start_time = time.time()
+    knot = draw_knot(braid, quiet=True)
+    coords = knot_to_coords(knot)
+    return analyze_coords(coords, path=path, quiet=quiet)
 
-    # determine command to run when clearing output
-    if name == "nt":
-        clear_cmd = "cls"
-    else:
-        clear_cmd = "clear"
 
-    # clear screen initially
-    ret_code = call(clear_cmd)
+def analysis_worker(conn):
+    """Analyze knot coordinates received through a pipe until None is received (runs in a separate process)."""
 
-    # get available space for progress bar
-    columns, lines = get_terminal_size()
-    columns = columns - 17 - 2 * len(str(runs))
+    # stdout may carry the results of the service, library notices go to stderr instead
+    sys.stdout = sys.stderr
+    # import the analysis libraries before the first job so it isn't charged for them
+    try:
+        from pyknotid.spacecurves import Knot
+        import sympy
+    except:
+        pass
+    conn.send(("ready", None))
 
-    # initialize path where braids are saved
-    braid_path = False
-    if save_braids:
-        if not path:
-            print(
-                "You must include the path to a file if you want to save the individual braids!."
-            )
-            return
+    while True:
+        coords = conn.recv()
+        if coords is None:
+            break
+        try:
+            results = analyze_coords(coords, path=False, quiet=True)
+        except Exception:
+            results = None
+        if results is None:
+            conn.send(("error", None))
         else:
-            if "." in path:
-                ext = path.index(".")
-                braid_dir = path[: (ext - len(path))]
-                mkdir(braid_dir)
-            else:
-                braid_dir = path
-                mkdir(braid_dir)
-
-    if path:
-        with open(path, "w") as csvfile:
-            writer = csv.writer(csvfile)
-            # write header
-            writer.writerow(("gauss", "crossingnum", "alexander"))
-            # generate data
-            for run in range(runs):
-                # if we can see whole braid, show progress at top
-                if lines - 40 >= t:
-                    bot_print = False
-                    progress = int(columns * ((run + 1) / runs))
-                    print("\n")
-                    print(
-                        f"[{'█'*progress}{'-'*(columns-progress)}] {run+1}/{runs} {round(((run+1)/runs)*100)}% {round(time.time()-start_time,1)}s"
-                    )
-                    print("\n")
-                else:
-                    print("\n")
-                    bot_print = True
-                # random colors each run if desired
-                if color == "random":
-                    active_color = random.choice(list(term_colors.keys()))
-                # define where each braid should be saved
-                if save_braids:
-                    braid_path = braid_dir + "/" + str(run + 1) + ".txt"
-                # generate braid
-                braid = t_steps(
-                    t,
-                    init_config,
-                    k_right=k_right,
-                    k_above=k_above,
-                    quiet=quiet,
-                    color=active_color,
-                    sleep=sleep,
-                    path=braid_path,
-                )
-                # show progress at bottom of terminal
-                if bot_print:
-                    print("\n")
-                    progress = int(columns * ((run + 1) / runs))
-                    print(
-                        f"[{'█'*progress}{'-'*(columns-progress)}] {run+1}/{runs} {round(((run+1)/runs)*100)}% {round(time.time()-start_time,1)}s"
-                    )
-                knot = draw_knot(braid, quiet=True)
-                coords = knot_to_coords(knot)
-                gauss_code, crossing_num, alexander_poly = analyze_coords(
-                    coords, path=False, quiet=True
-                )
-                # write data
-                writer.writerow((gauss_code, crossing_num, alexander_poly))
-                # clear screen
-                ret_code = call(clear_cmd)
-    else:
-        # generate data
-        for run in range(runs):
-            # if we can see whole braid, show progress at top
-            if lines - 40 >= t:
-                bot_print = False
-                progress = int(columns * ((run + 1) / runs))
-                print("\n")
-                print(
-                    f"[{'█'*progress}{'-'*(columns-progress)}] {run+1}/{runs} {round(((run+1)/runs)*100)}% {round(time.time()-start_time,1)}s"
-                )
-                print("\n")
-            else:
-                print("\n")
-                bot_print = True
-            # random colors each run if desired
-            if color == "random":
-                active_color = random.choice(list(term_colors.keys()))
-            # generate braid
-            braid = t_steps(
-                t,
-                init_config,
-                k_right=k_right,
-                k_above=k_above,
-                quiet=quiet,
-                color=active_color,
-                sleep=sleep,
-                path=braid_path,
-            )
-            # show progress at bottom of terminal
-            if bot_print:
-                print("\n")
-                progress = int(columns * ((run + 1) / runs))
-                print(
-                    f"[{'█'*progress}{'-'*(columns-progress)}] {run+1}/{runs} {round(((run+1)/runs)*100)}% {round(time.time()-start_time,1)}s"
-                )
-            knot = draw_knot(braid, quiet=True)
-            coords = knot_to_coords(knot)
-            gauss_code, crossing_num, alexander_poly = analyze_coords(
-                coords, path=False, quiet=True
-            )
-            # clear screen
-            ret_code = call(clear_cmd)
-    # clear screen
-    ret_code = call(clear_cmd)
-    # print results
-    print(f"tbkm: {runs} runs completed in {round(time.time()-start_time,1)}s")
+            conn.send(("ok", results))
 
     return
 
 
-# parse commandline input
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(
-        description="generate (and analyze) knots with a terminal braid knotting model"
-    )
-    parser.add_argument(
-        "configuration",
-        choices=["raymer", "peppino", "twist"],
-        help="select the initial configuration of coil and its terminal end",
-    )
-    parser.add_argument(
-        "select",
-        choices=["braid", "knot", "analyze", "model"],
-        help="generate single braid, braid + closed knot, braid + closed knot + analysis or perform multiple runs",
-    )
+# analysis processes are forked from a server process without threads where possible,
+# a process forked while another thread is importing a module can't import it
+if "forkserver" in get_all_start_methods():
+    analysis_context = get_context("forkserver")
+else:
+    analysis_context = get_context()
 
-    parser.add_argument(
-        "-l", "--loops", type=int, help="<required> number of loops", required=True
-    )
-    parser.add_argument(
-        "-i",
-        "--inactive",
-        type=int,
-        help="number of random loops which are inaccessible to the terminal end (it will always pass over them)",
-    )
-    parser.add_argument(
-        "-I",
-        "--spec_inactive",
-        nargs="*",
-        type=int,
-        help="specific loops (from left) which are inaccessible to the terminal end (it will always pass over them)",
-    )
 
-    parser.add_argument(
-        "-r",
-        "--right",
-        default=0.5,
-        type=float,
-        help="probability of terminal end moving right (default 0.5)",
-    )
-    parser.add_argument(
-        "-a",
-        "--above",
-        default=0.5,
-        type=float,
-        help="probability of terminal end crossing above adjacent loop instead of below (default 0.5)",
-    )
-    parser.add_argument(
+class AnalysisWorker:
+    """Separate process for knot analysis which can be killed if an analysis takes too long."""
+
+    def __init__(self):
+        # job currently being analyzed
+        self.job = None
+        self.start()
+
+    def start(self):
+        """Start the worker process."""
+
+        self.conn, child_conn = analysis_context.Pipe()
+        self.process = analysis_context.Process(
+            target=analysis_worker, args=(child_conn,), daemon=True
+        )
+        self.process.start()
+        # wait until the worker is ready to analyze
+        self.conn.recv()
+
+    def analyze(self, coords, timeout=False):
+        """Analyze knot coordinates and return the status (ok, error or timeout) and results of analyze_coords.
+
+        Keyword arguments:
+        coords -- list of coordinates in the form [x,y,z]
+        timeout -- time in seconds after which the analysis is killed (default False)
+        """
+
+        self.submit(None, coords)
+        if self.conn.poll(timeout if timeout else None):
+            job, status, results = self.collect()
+            return (status, results)
+        self.kill()
+        return ("timeout", None)
+
+    def submit(self, job, coords):
+        """Start analyzing knot coordinates without waiting for the results.
+
+        Keyword arguments:
+        job -- anything identifying the analysis, returned by collect along with its results
+        coords -- list of coordinates in the form [x,y,z]
+        """
+
+        self.job = job
+        self.started = time.time()
+        self.conn.send(coords)
+
+    def collect(self):
+        """Wait for the submitted analysis and return its job, status (ok or error) and results of analyze_coords."""
+
+        job = self.job
+        self.job = None
+        status, results = self.conn.recv()
+        return (job, status, results)
+
+    def expired(self, timeout):
+        """Check if the submitted analysis has been running for longer than timeout seconds."""
+
+        return (
+            bool(timeout)
+            and self.job is not None
+            and time.time() - self.started > timeout
+        )
+
+    def kill(self):
+        """Kill the submitted analysis, start a fresh worker for the next one and return the killed job."""
+
+        job = self.job
+        self.job = None
+        self.process.kill()
+        self.process.join()
+        self.start()
+        return job
+
+    def close(self):
+        """Stop the worker process."""
+
+        self.conn.send(None)
+        self.process.join()
+
+
+class AnalysisCache:
+    """Analysis results of the most recently seen knots, so identical knots are only analyzed once.
+
+    The least recently used knots are forgotten so the cache stays in constant memory.
+    """
+
+    def __init__(self, size=100000):
+        """Keyword arguments:
+        size -- number of knots whose analysis results are kept (default 100000)
+        """
+
+        self.size = size
+        self.results = OrderedDict()
+
+    def get(self, knot):
+        """Return the analysis results of a knot string or None if it is not in the cache."""
+
+        results = self.results.get(knot)
+        if results is not None:
+            self.results.move_to_end(knot)
+        return results
+
+    def put(self, knot, results):
+        """Keep the analysis results of a knot string, forgetting the least recently used knot if the cache is full."""
+
+        self.results[knot] = results
+        self.results.move_to_end(knot)
+        if len(self.results) > self.size:
+            self.results.popitem(last=False)
+
+
+def dispatch_analyses(
+    pool, next_job, finish, cache, max_crossings=False, timeout=False
+):
+    """Hand out jobs to a pool of analysis workers until there are no more jobs and every analysis is finished.
+
+    Keyword arguments:
+    pool -- list of AnalysisWorkers
+    next_job -- function returning the next (job, knot string, knot coordinates) tuple, None if no job is ready yet
+                or False once there are no more jobs, called with True when no worker is busy so it may wait for a job
+    finish -- function receiving each job with the status and results of its analysis
+    cache -- AnalysisCache of the results of identical knots, which are only analyzed once
+    max_crossings -- skip the analysis of knot diagrams with more crossings (default False)
+    timeout -- time in seconds after which the analysis of a job is killed (default False)
+    """
+
+    exhausted = False
+    while not exhausted or any(worker.job is not None for worker in pool):
+        # hand out jobs to idle workers
+        for worker in pool:
+            while worker.job is None and not exhausted:
+                item = next_job(all(w.job is None for w in pool))
+                if item is None:
+                    break
+                if item is False:
+                    exhausted = True
+                    break
+                job, knot, coords = item
+                analysis = cache.get(knot)
+                if analysis is not None:
+                    finish(job, "ok", analysis)
+                    continue
+                if max_crossings and diagram_crossings(coords) > max_crossings:
+                    finish(job, "skipped", None)
+                    continue
+                worker.submit((job, knot), coords)
+        busy = [worker for worker in pool if worker.job is not None]
+        if not busy:
+            continue
+        # wait for results, waking up regularly to hand out new jobs and enforce the timeout
+        ready = wait([worker.conn for worker in busy], timeout=0.05)
+        for worker in busy:
+            if worker.conn in ready:
+                (job, knot), status, analysis = worker.collect()
+                if status == "ok":
+                    cache.put(knot, analysis)
+                finish(job, status, analysis)
+            elif worker.expired(timeout):
+                job, knot = worker.kill()
+                finish(job, "timeout", None)
+
+    return
+
+
+def analyze_within_budget(coords, max_crossings=False, worker=False, timeout=False):
+    """Analyze knot coordinates unless they are over budget and return the status (ok, skipped, error or timeout) and results of analyze_coords.
+
+    Keyword arguments:
+    coords -- list of coordinates in the form [x,y,z]
+    max_crossings -- skip the analysis of diagrams with more crossings (default False)
+    worker -- AnalysisWorker in which to run the analysis, required for the timeout (default False)
+    timeout -- time in seconds after which the analysis is killed (default False)
+    """
+
+    if max_crossings and diagram_crossings(coords) > max_crossings:
+        return ("skipped", None)
+    if worker:
+        return worker.analyze(coords, timeout=timeout)
+    try:
+        results = analyze_coords(coords, path=False, quiet=True)
+    except Exception:
+        results = None
+    if results is None:
+        return ("error", None)
+    return ("ok", results)
+
+
+def result_row(status, analysis, braid, **params):
+    """Combine the parameters, analysis status and results of a run into one row of output data.
+
+    Runs which were not analyzed keep their braid so they can be analyzed later.
+
+    Keyword arguments:
+    status -- status of the analysis (ok, skipped, error or timeout)
+    analysis -- results of analyze_coords (None unless status is ok)
+    braid -- tuple or list containing all rows of the braid
+    params -- any other columns (run, seed, configuration, loops, moves, k_right, k_above, weight, inactive)
+    """
+
+    row = dict(params)
+    if status == "ok":
+        gauss_code, crossing_num, alexander_poly, knot_type, coeffs = analysis
+        row.update(gauss=gauss_code, crossingnum=crossing_num, knottype=knot_type)
+        row.update(alexander=alexander_poly, coefficients=coeffs)
+        row["braid"] = ""
+    else:
+        row.update(gauss="", crossingnum=-1, alexander="", knottype="")
+        row["coefficients"] = None
+        row["braid"] = "\n".join(braid)
+    row["status"] = status
+    row.setdefault("weight", 1.0)
+    row.setdefault("inactive", -1)
+
+    return row
+
+
+def alexander_coefficients(alexander, variable):
+    """Return the integer coefficients of a sympy alexander polynomial normalized for sign and powers of t.
+
+    Keyword arguments:
+    alexander -- alexander polynomial as a sympy expression
+    variable -- sympy symbol used in the polynomial
+    """
+
+    import sympy
+
+    # clear negative powers of t
+    numerator = sympy.numer(sympy.together(sympy.expand(alexander)))
+    coeffs = [int(c) for c in sympy.Poly(numerator, variable).all_coeffs()]
+    # divide out remaining powers of t
+    while len(coeffs) > 1 and coeffs[-1] == 0:
+        coeffs.pop()
+    # the polynomial is only defined up to sign
+    if coeffs[0] < 0:
+        coeffs = [-c for c in coeffs]
+
+    return tuple(coeffs)
+
+
+def parse_alexander(alexander_poly):
+    """Return the normalized integer coefficients of an alexander polynomial saved as a string."""
+
+    import sympy
+
+    t = sympy.Symbol("t")
+    return alexander_coefficients(sympy.sympify(alexander_poly, locals={"t": t}), t)
+
+
+def format_alexander(coeffs):
+    """Return normalized alexander polynomial coefficients as a polynomial string in t (written like sympy)."""
+
+    terms = []
+    for power, coeff in zip(range(len(coeffs) - 1, -1, -1), coeffs):
+        if coeff == 0:
+            continue
+        if power == 0:
+            term = str(abs(coeff))
+        else:
+            term = "t" if power == 1 else f"t**{power}"
+            if abs(coeff) != 1:
+                term = f"{abs(coeff)}*{term}"
+        if not terms:
+            terms.append(("-" if coeff < 0 else "") + term)
+        else:
+            terms.append(("- " if coeff < 0 else "+ ") + term)
+
+    return " ".join(terms) if terms else "0"
+
+
+def classify_alexander(coeffs):
+    """Return the knot type id of normalized alexander polynomial coefficients (unknown_knot if not in table)."""
+
+    return alexander_table.get(tuple(coeffs), unknown_knot)
+
+
+def knot_type_name(knot_type):
+    """Return the name of a knot type id."""
+
+    if knot_type == unknown_knot:
+        return "unknown"
+    return knot_types[knot_type]
+
+
+def knot_type_id(knot_type):
+    """Return the id of a knot type name."""
+
+    if knot_type in knot_types:
+        return knot_types.index(knot_type)
+    return unknown_knot
+
+
+def write_header(path):
+    """Initialize csv file with appropriate header for knot data."""
+
+    # warning, will overwrite the file if it already exists
+    with open(path, "w") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(csv_header)
+
+    return
+
+
+def init_columnar(path):
+    """Initialize directory holding columnar knot data and return the number of runs it already contains.
+
+    Each column is stored as a raw little-endian binary file so new runs can be appended
+    and the data can be memory mapped when loaded.
+    Existing data is kept so several models can be appended to the same directory.
+    """
+
+    makedirs(path, exist_ok=True)
+    meta_path = path + "/meta.json"
+    if exists(meta_path):
+        with open(meta_path) as f:
+            return json.load(f)["rows"]
+
+    meta = {
+        "rows": 0,
+        "columns": dict(columnar_columns),
+        "packed": list(columnar_packed),
+        "categories": {category: [] for category in columnar_categories},
+    }
+    # create empty column files
+    for column, dtype in columnar_columns:
+        open(path + "/" + column + ".bin", "wb").close()
+    for column in columnar_packed:
+        open(path + "/" + column + ".bin", "wb").close()
+        open(path + "/" + column + "_offsets.bin", "wb").close()
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+
+    return 0
+
+
+def append_columnar(path, rows):
+    """Append runs to a columnar knot data directory created by init_columnar.
+
+    Keyword arguments:
+    path -- directory holding the columnar data
+    rows -- list of dictionaries with one value for each column (see result_row), knot types given by name
+    """
+
+    try:
+        import numpy
+    except:
+        print("You must have numpy installed to save columnar data!")
+        return
+
+    meta_path = path + "/meta.json"
+    with open(meta_path) as f:
+        meta = json.load(f)
+    n_rows = meta["rows"]
+
+    # alexander polynomials are stored in their normalized form so equal polynomials share an id
+    categorical = {
+        category: [row[category] for row in rows] for category in columnar_categories
+    }
+    categorical["alexander"] = [
+        format_alexander(row["coefficients"]) if row.get("coefficients") else ""
+        for row in rows
+    ]
+
+    # map categorical values to integer ids, extending the dictionaries with new values
+    ids = {}
+    for category in columnar_categories:
+        values = meta["categories"][category]
+        ids[category] = {value: i for i, value in enumerate(values)}
+        for value in categorical[category]:
+            if value not in ids[category]:
+                ids[category][value] = len(values)
+                values.append(value)
+
+    # fixed-width columns
+    for column, dtype in columnar_columns:
+        # columns added since the directory was created are -1 (unknown) for the existing runs
+        if column not in meta["columns"]:
+            with open(path + "/" + column + ".bin", "wb") as f:
+                f.write(numpy.full(n_rows, -1, dtype=dtype).tobytes())
+            meta["columns"][column] = dtype
+        if column in columnar_categories:
+            values = [ids[column][value] for value in categorical[column]]
+        elif column == "knottype":
+            values = [knot_type_id(row[column]) for row in rows]
+        elif column == "inactive":
+            # masks which don't fit are unknown
+            values = [row[column] if row[column] < 2 ** 63 else -1 for row in rows]
+        else:
+            values = [row[column] for row in rows]
+        array = numpy.array(values, dtype=dtype)
+        with open(path + "/" + column + ".bin", "r+b") as f:
+            # drop anything left behind by an interrupted append
+            f.truncate(n_rows * array.itemsize)
+            f.seek(0, 2)
+            f.write(array.tobytes())
+
+    # variable-length columns
+    for column in columnar_packed:
+        encoded = [row[column].encode("utf-8") for row in rows]
+        with open(path + "/" + column + "_offsets.bin", "r+b") as f:
+            f.truncate(n_rows * 8)
+            if n_rows:
+                f.seek((n_rows - 1) * 8)
+                start = int(numpy.frombuffer(f.read(8), dtype="<i8")[0])
+            else:
+                start = 0
+            ends = start + numpy.cumsum([len(e) for e in encoded], dtype="<i8")
+            f.seek(0, 2)
+            f.write(ends.astype("<i8").tobytes())
+        with open(path + "/" + column + ".bin", "r+b") as f:
+            f.truncate(start)
+            f.seek(0, 2)
+            f.write(b"".join(encoded))
+
+    # the row count is only updated once all columns are written
+    meta["rows"] = n_rows + len(rows)
+    with open(meta_path + ".tmp", "w") as f:
+        json.dump(meta, f)
+    replace(meta_path + ".tmp", meta_path)
+
+    return
+
+
+def load_columnar(path, mmap=True):
+    """Load columnar knot data as a dictionary of numpy arrays.
+
+    Categorical columns hold integer ids into the lists in data["categories"].
+    Packed columns hold raw utf-8 bytes with the end offset of each run in <column>_offsets;
+    use packed_value to decode a single run.
+
+    Keyword arguments:
+    path -- directory holding the columnar data
+    mmap -- memory map the column files instead of reading them into memory (default True)
+    """
+
+    try:
+        import numpy
+    except:
+        print("You must have numpy installed to load columnar data!")
+        return
+
+    with open(path + "/meta.json") as f:
+        meta = json.load(f)
+    n_rows = meta["rows"]
+
+    def load_column(column, dtype, count):
+        if count == 0:
+            return numpy.zeros(0, dtype=dtype)
+        if mmap:
+            return numpy.memmap(
+                path + "/" + column + ".bin", dtype=dtype, mode="r", shape=(count,)
+            )
+        return numpy.fromfile(path + "/" + column + ".bin", dtype=dtype, count=count)
+
+    data = {}
+    for column, dtype in meta["columns"].items():
+        data[column] = load_column(column, dtype, n_rows)
+    for column in meta["packed"]:
+        offsets = load_column(column + "_offsets", "<i8", n_rows)
+        data[column + "_offsets"] = offsets
+        data[column] = load_column(column, "u1", int(offsets[-1]) if n_rows else 0)
+    data["categories"] = meta["categories"]
+
+    return data
+
+
+def packed_value(data, column, index):
+    """Decode the value of a packed column (e.g. gauss) for a single run of loaded columnar data."""
+
+    offsets = data[column + "_offsets"]
+    start = int(offsets[index - 1]) if index > 0 else 0
+    return bytes(data[column][start : int(offsets[index])]).decode("utf-8")
+
+
+class RunStatistics:
+    """Streaming statistics of the runs of a model, kept in constant memory.
+
+    Runs can be weighted (e.g. by their likelihood ratio when sampling with biased probabilities),
+    in which case proportions and the crossing number moments are weighted averages and the
+    confidence intervals use the effective number of runs.
+    """
+
+    def __init__(self, z=1.96):
+        """Keyword arguments:
+        z -- standard score of the confidence intervals (default 1.96 for 95%)
+        """
+
+        self.z = z
+        # number of analyzed runs
+        self.runs = 0
+        self.statuses = {}
+        self.counts = {}
+        # sums of weights (and squared weights) of analyzed runs
+        self.weight_sum = 0
+        self.weight_sq_sum = 0
+        self.weights = {}
+        self.alexander_weights = {}
+        # running weighted mean and sum of squared deviations of the crossing number (West)
+        self.crossing_mean = 0.0
+        self.crossing_m2 = 0.0
+        self.crossing_histogram = {}
+        # normalized form of each alexander polynomial seen so far
+        self.normalized = {}
+
+    def add(
+        self, status, knot_type=None, crossing_num=None, coefficients=None, weight=1
+    ):
+        """Record a run, only the status is needed for runs which were not analyzed.
+
+        Keyword arguments:
+        status -- status of the analysis (ok, skipped, error or timeout)
+        knot_type -- name of the knot type (default None)
+        crossing_num -- crossing number (default None)
+        coefficients -- normalized alexander polynomial coefficients (default None)
+        weight -- weight of the run (default 1)
+        """
+
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status != "ok":
+            return
+
+        self.runs += 1
+        self.counts[knot_type] = self.counts.get(knot_type, 0) + 1
+        self.weight_sum += weight
+        self.weight_sq_sum += weight ** 2
+        self.weights[knot_type] = self.weights.get(knot_type, 0) + weight
+
+        coefficients = tuple(coefficients)
+        if coefficients not in self.normalized:
+            self.normalized[coefficients] = format_alexander(coefficients)
+        alexander_poly = self.normalized[coefficients]
+        self.alexander_weights[alexander_poly] = (
+            self.alexander_weights.get(alexander_poly, 0) + weight
+        )
+
+        if weight:
+            delta = crossing_num - self.crossing_mean
+            self.crossing_mean += delta * weight / self.weight_sum
+            self.crossing_m2 += weight * delta * (crossing_num - self.crossing_mean)
+        self.crossing_histogram[crossing_num] = (
+            self.crossing_histogram.get(crossing_num, 0) + weight
+        )
+
+    def effective_runs(self):
+        """Return the effective number of runs (equal to the number of analyzed runs without weights)."""
+
+        if not self.weight_sq_sum:
+            return 0
+        return self.weight_sum ** 2 / self.weight_sq_sum
+
+    def proportions(self):
+        """Return the proportion of each knot type seen so far and of knotted runs ("knotted")."""
+
+        if not self.weight_sum:
+            return {}
+        proportions = {k: w / self.weight_sum for k, w in self.weights.items()}
+        proportions["knotted"] = 1 - proportions.get("0_1", 0)
+        return proportions
+
+    def half_width(self, proportion):
+        """Return the half-width of the Wilson score interval of a proportion."""
+
+        n = self.effective_runs()
+        z = self.z
+        return (
+            z
+            * ((proportion * (1 - proportion) / n) + (z ** 2 / (4 * n ** 2))) ** 0.5
+            / (1 + z ** 2 / n)
+        )
+
+    def standard_error(self, proportion):
+        """Return the standard error of a proportion."""
+
+        return (proportion * (1 - proportion) / self.effective_runs()) ** 0.5
+
+    def crossing_variance(self):
+        """Return the (reliability weighted) sample variance of the crossing number."""
+
+        if self.runs < 2 or not self.weight_sum:
+            return 0.0
+        denominator = self.weight_sum - self.weight_sq_sum / self.weight_sum
+        if denominator <= 0:
+            return 0.0
+        return self.crossing_m2 / denominator
+
+    def converged(self, target_ci):
+        """Check if the confidence interval half-width of every proportion is under target_ci."""
+
+        proportions = self.proportions()
+        if not proportions:
+            return False
+        return all(self.half_width(p) < target_ci for p in proportions.values())
+
+    def progress(self):
+        """Return a short description of the statistics for the progress bar."""
+
+        if not self.weight_sum:
+            return ""
+        knotted = self.proportions()["knotted"]
+        text = f"knotted {knotted:.3f}±{self.standard_error(knotted):.3f} crossings {self.crossing_mean:.2f}"
+        if self.effective_runs() != self.runs:
+            text += f" ess {self.effective_runs():.1f}"
+        return text
+
+    def summary(self):
+        """Return all statistics as a dictionary."""
+
+        proportions = self.proportions()
+        knotted = proportions.get("knotted", 0)
+        return {
+            "runs": sum(self.statuses.values()),
+            "analyzed": self.runs,
+            "effective": self.effective_runs(),
+            "statuses": self.statuses,
+            "knottypes": {
+                knot_type: {
+                    "count": self.counts[knot_type],
+                    "proportion": proportions[knot_type],
+                    "ci": self.half_width(proportions[knot_type]),
+                }
+                for knot_type in sorted(self.counts)
+                if knot_type in proportions
+            },
+            "alexander": self.alexander_weights,
+            "knotted": {
+                "proportion": knotted,
+                "stderr": self.standard_error(knotted) if self.weight_sum else 0.0,
+            },
+            "crossingnum": {
+                "mean": self.crossing_mean,
+                "variance": self.crossing_variance(),
+                "histogram": {
+                    str(c): self.crossing_histogram[c]
+                    for c in sorted(self.crossing_histogram)
+                },
+            },
+        }
+
+
+def progress_line(done, total, start_time, width, info=""):
+    """Return a progress bar (with any additional information) filling the given width."""
+
+    elapsed = round(time.time() - start_time, 1)
+    text = f" {done}/{total} {round((done/total)*100)}% {elapsed}s"
+    if info:
+        text += " " + info
+    bar = max(width - len(text) - 2, 0)
+    progress = int(bar * (done / total))
+    return f"[{'█'*progress}{'-'*(bar-progress)}]{text}"
+
+
+def describe_config(init_config):
+    """Return the name of an initial configuration and its number of loops."""
+
+    # if ┃ isn't present in the first layer of the init state, we can assume there are multiple rows
+    if "┃" not in init_config:
+        rows = init_config
+    else:
+        rows = (init_config,)
+    loops = rows[0].count("│") + rows[0].count("┆")
+    configuration = {1: "raymer", 3: "peppino", 7: "twist"}.get(len(rows), "custom")
+
+    return (configuration, loops)
+
+
+def run_pipeline(
+    jobs,
+    prepare,
+    finish,
+    workers=False,
+    queue_size=64,
+    max_crossings=False,
+    timeout=False,
+    progress=None,
+):
+    """Analyze a stream of jobs with three overlapping stages connected by bounded queues and return how busy each stage was.
+
+    One thread prepares the jobs, one thread per analysis process analyzes them and one thread finishes them
+    in the order they are analyzed. Each queue holds at most queue_size jobs, so a stage waits for the next one
+    when it gets too far ahead and the memory used stays bounded.
+    If a stage raises an exception, the pipeline stops, the jobs left in the queues are dropped
+    and the exception is raised again here.
+
+    Keyword arguments:
+    jobs -- iterable of jobs to prepare
+    prepare -- function returning the job to carry through the pipeline and its knot coordinates for each job
+    finish -- function receiving each job with the status and results of its analysis, returning True to stop preparing jobs
+    workers -- number of analysis processes (default False, one per cpu)
+    queue_size -- number of jobs each queue can hold (default 64)
+    max_crossings -- skip the analysis of knot diagrams with more crossings (default False)
+    timeout -- time in seconds after which the analysis of a job is killed (default False)
+    progress -- function called regularly with the depth of each queue and the busy fraction of each stage (default None)
+    """
+
+    workers = workers or cpu_count()
+    # analysis processes are started before the threads which could hold locks when they fork
+    pool = [AnalysisWorker() for i in range(workers)]
+    prepared = queue.Queue(maxsize=queue_size)
+    analyzed = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    # time each stage spent working (not waiting for the queues)
+    busy = {"prepare": 0.0, "analyze": 0.0, "finish": 0.0}
+    busy_lock = threading.Lock()
+
+    # exceptions raised by the stages
+    errors = []
+
+    def working(stage, started):
+        with busy_lock:
+            busy[stage] += time.time() - started
+
+    def failed(error):
+        with busy_lock:
+            errors.append(error)
+        stop.set()
+
+    def preparer():
+        try:
+            for job in jobs:
+                if stop.is_set():
+                    break
+                started = time.time()
+                item = prepare(job)
+                working("prepare", started)
+                prepared.put(item)
+        except Exception as e:
+            failed(e)
+        finally:
+            # one end marker for each analysis thread
+            for worker in pool:
+                prepared.put(None)
+
+    def analyzer(worker):
+        while True:
+            item = prepared.get()
+            if item is None:
+                break
+            # after a failure the queue is only drained so the other stages don't block
+            if errors:
+                continue
+            try:
+                job, coords = item
+                started = time.time()
+                status, analysis = analyze_within_budget(
+                    coords, max_crossings=max_crossings, worker=worker, timeout=timeout
+                )
+                working("analyze", started)
+                analyzed.put((job, status, analysis))
+            except Exception as e:
+                failed(e)
+        analyzed.put(None)
+
+    def finisher():
+        running = workers
+        while running:
+            item = analyzed.get()
+            if item is None:
+                running -= 1
+                continue
+            if errors:
+                continue
+            try:
+                started = time.time()
+                if finish(*item):
+                    stop.set()
+                working("finish", started)
+            except Exception as e:
+                failed(e)
+
+    start_time = time.time()
+    threads = [threading.Thread(target=preparer, daemon=True)]
+    threads += [
+        threading.Thread(target=analyzer, args=(worker,), daemon=True)
+        for worker in pool
+    ]
+    threads.append(threading.Thread(target=finisher, daemon=True))
+    for thread in threads:
+        thread.start()
+
+    def utilisation():
+        elapsed = max(time.time() - start_time, 1e-9)
+        with busy_lock:
+            return {
+                "prepare": busy["prepare"] / elapsed,
+                "analyze": busy["analyze"] / (elapsed * workers),
+                "finish": busy["finish"] / elapsed,
+            }
+
+    # the finishing thread is the last to end
+    try:
+        while threads[-1].is_alive():
+            threads[-1].join(0.5)
+            if progress:
+                progress((prepared.qsize(), analyzed.qsize()), utilisation())
+    finally:
+        for worker in pool:
+            # a failed analysis can leave its process in any state
+            if errors or threads[-1].is_alive():
+                worker.process.kill()
+            else:
+                worker.close()
+    if errors:
+        raise errors[0]
+
+    return utilisation()
+
+
+def run_model(
+    runs,
+    t,
+    init_config,
+    k_right=0.5,
+    k_above=0.5,
+    quiet=False,
+    color="random",
+    sleep=False,
+    save_braids=False,
+    path=False,
+    fmt="csv",
+    seed=None,
+    max_crossings=False,
+    timeout=False,
+    target_ci=False,
+    summary=False,
+    bias_right=None,
+    bias_above=None,
+    viewport=False,
+    inactive=False,
+    workers=False,
+    queue_size=64,
+):
+    """Run multiple tumbling models and optionally save the data.
+
+    Keyword arguments:
+    init_state -- initial starting configuration of braid (all rows)
+    k_right -- probability of active end moving to the right (default 0.5)
+    k_above -- probability of active end moving over an adjacent loop (default 0.5)
+    quiet -- suppress output (default False)
+    color -- color active end in terminal with one of red, green, yellow, blue, magenta, cyan or white
+             if random, each run will display with a random color from those listed above (default random)
+    sleep -- time in seconds to delay between displaying each braid step (default False)
+    save_braids -- boolean to save each braid as a textfile in a subdirectory with the same name as the csv in path (default False)
+    path -- csv file or columnar directory in which you want to save the output analysis data (default False)
+    fmt -- format of the output analysis data, csv or columnar (default csv)
+    seed -- seed from which the seed of each run is drawn (default None)
+    max_crossings -- skip the analysis of knot diagrams with more crossings (default False)
+    timeout -- time in seconds after which the analysis of a run is killed (default False)
+    target_ci -- stop before runs once the confidence interval half-width of every knot type proportion is under target_ci (default False)
+    summary -- json file in which you want to save the statistics of all runs (default False)
+    bias_right -- sample braids with this probability of moving right instead of k_right and weight each run by its likelihood ratio (default None)
+    bias_above -- sample braids with this probability of moving over a loop instead of k_above and weight each run by its likelihood ratio (default None)
+    viewport -- only display the part of each braid which fits in the terminal (default False)
+    inactive -- number of random non-interacting loops selected again for each run of init_config (default False)
+    workers -- number of analysis processes of a pipelined model, braids aren't displayed (default False, one run at a time)
+    queue_size -- number of runs each queue of a pipelined model can hold (default 64)
+    """
+
+    # record start time
+    start_time = time.time()
+
+    # determine command to run when clearing output
+    if name == "nt":
+        clear_cmd = "cls"
+    else:
+        clear_cmd = "clear"
+
+    # clear screen initially
+    ret_code = call(clear_cmd)
+
+    # get available space for progress bar
+    columns, lines = get_terminal_size()
+    # leave room for the progress bar under the braid
+    if viewport:
+        viewport = Viewport(lines=lines - 6)
+
+    # each run is seeded so it can be reproduced from the saved data
+    seeder = random.Random(seed)
+    configuration, loops = describe_config(init_config)
+
+    # layouts of non-interacting loops are sampled in batches
+    if inactive:
+        try:
+            import numpy
+        except:
+            print("You must have numpy installed to sample inactive loops per run!")
+            return
+        if inactive > loops - 1:
+            print("non-interacting loops must be fewer than total loops")
+            return
+        rng = numpy.random.default_rng(seed)
+        inactive_batch = 10000
+
+    # importance sampling draws braids from biased probabilities
+    # and weights each run by its likelihood ratio under the target probabilities
+    weighted = bias_right is not None or bias_above is not None
+    if bias_right is None:
+        bias_right = k_right
+    if bias_above is None:
+        bias_above = k_above
+    start = 1 if "┃" in init_config else len(init_config)
+
+    # columnar data can be appended so runs are numbered after existing ones
+    first_run = 0
+    if path and fmt == "columnar":
+        first_run = init_columnar(path)
+
+    # initialize path where braids are saved
+    braid_path = False
+    if save_braids:
+        if not path:
+            print(
+                "You must include the path to a file if you want to save the individual braids!."
+            )
+            return
+        elif fmt == "columnar":
+            braid_dir = path + "/braids"
+            makedirs(braid_dir, exist_ok=True)
+        else:
+            if "." in path:
+                ext = path.index(".")
+                braid_dir = path[: (ext - len(path))]
+                mkdir(braid_dir)
+            else:
+                braid_dir = path
+                mkdir(braid_dir)
+
+    # runs are only saved with their weight and inactive loops when these change between runs
+    header = csv_header + status_header
+    if weighted:
+        header += ("weight",)
+    if inactive:
+        header += ("inactive",)
+    writer = False
+    if path and fmt == "csv":
+        csvfile = open(path, "w")
+        writer = csv.writer(csvfile)
+        # write header
+        writer.writerow(header)
+    # columnar rows are buffered and appended in batches
+    columnar_rows = []
+
+    # statistics are kept as runs complete so per-run data doesn't need to be saved
+    statistics = RunStatistics()
+
+    def record(row):
+        """Add a completed run to the statistics and the saved data."""
+
+        nonlocal columnar_rows
+        statistics.add(
+            row["status"],
+            row["knottype"],
+            row["crossingnum"],
+            row["coefficients"],
+            row["weight"],
+        )
+        # write data
+        if writer:
+            writer.writerow([row[column] for column in header])
+        elif path and fmt == "columnar":
+            columnar_rows.append(row)
+            if len(columnar_rows) >= 1000:
+                append_columnar(path, columnar_rows)
+                columnar_rows = []
+
+    def likelihood_ratio(braid):
+        """Return the weight of a braid sampled with the biased probabilities."""
+
+        if not weighted:
+            return 1
+        return math.exp(
+            braid_log_likelihood(braid, start, k_right, k_above)
+            - braid_log_likelihood(braid, start, bias_right, bias_above)
+        )
+
+    def run_config(run):
+        """Return the initial configuration of a run, sampling the inactive loops of the next batch if needed."""
+
+        nonlocal masks
+        if not inactive:
+            return init_config
+        if run % inactive_batch == 0:
+            masks = sample_inactive(
+                min(inactive_batch, runs - run), loops, inactive, rng
+            )
+        return apply_inactive(init_config, masks[run % inactive_batch])
+
+    masks = None
+    completed = 0
+    stages = None
+
+    # a pipeline overlaps the generation, analysis and saving of runs
+    if workers:
+
+        def prepare(run):
+            # seed this run
+            run_seed = seeder.getrandbits(32)
+            random.seed(run_seed)
+            config = run_config(run)
+            braid = t_steps(t, config, bias_right, bias_above, quiet=True)
+            knot = draw_knot(braid, quiet=True)
+            job = (run, run_seed, braid, likelihood_ratio(braid), inactive_mask(config))
+            return (job, knot_to_coords(knot))
+
+        def finish(job, status, analysis):
+            nonlocal completed, live
+            run, run_seed, braid, weight, mask = job
+            # braids are saved here so the generation isn't held up by the disk
+            if save_braids:
+                braid_path = braid_dir + "/" + str(first_run + run + 1) + ".txt"
+                with open(braid_path, "w") as f:
+                    for row in braid:
+                        f.write(row + "\n")
+            record(
+                result_row(
+                    status,
+                    analysis,
+                    braid,
+                    run=first_run + run,
+                    seed=run_seed,
+                    configuration=configuration,
+                    loops=loops,
+                    moves=t,
+                    k_right=k_right,
+                    k_above=k_above,
+                    weight=weight,
+                    inactive=mask,
+                )
+            )
+            completed += 1
+            # the statistics are only read by this thread while they change
+            live = statistics.progress()
+            # the runs already generated are still analyzed and saved
+            return target_ci and statistics.converged(target_ci)
+
+        def show(depths, busy):
+            info = live + " " if live else ""
+            info += "queued " + "/".join(str(depth) for depth in depths)
+            info += " busy " + "/".join(f"{b:.0%}" for b in busy.values())
+            if not quiet:
+                line = progress_line(completed, runs, start_time, columns - 1, info)
+                print(line, end="\r", flush=True)
+
+        live = ""
+        try:
+            stages = run_pipeline(
+                range(runs),
+                prepare,
+                finish,
+                workers=workers,
+                queue_size=queue_size,
+                max_crossings=max_crossings,
+                timeout=timeout,
+                progress=show,
+            )
+        finally:
+            # runs finished before a stage failed are still saved
+            if writer:
+                csvfile.close()
+            if columnar_rows:
+                append_columnar(path, columnar_rows)
+                columnar_rows = []
+    else:
+        # the analysis can only be killed if it runs in a separate process
+        worker = False
+        if timeout:
+            worker = AnalysisWorker()
+
+        active_color = color
+        # generate data
+        for run in range(runs):
+            # if we can see whole braid, show progress at top
+            if lines - 40 >= t:
+                bot_print = False
+                print("\n")
+                print(
+                    progress_line(
+                        run + 1, runs, start_time, columns - 1, statistics.progress()
+                    )
+                )
+                print("\n")
+            else:
+                print("\n")
+                bot_print = True
+            # random colors each run if desired
+            if color == "random":
+                active_color = random.choice(list(term_colors.keys()))
+            # seed this run
+            run_seed = seeder.getrandbits(32)
+            random.seed(run_seed)
+            # define where each braid should be saved
+            if save_braids:
+                braid_path = braid_dir + "/" + str(first_run + run + 1) + ".txt"
+            # generate braid
+            config = run_config(run)
+            braid = t_steps(
+                t,
+                config,
+                k_right=bias_right,
+                k_above=bias_above,
+                quiet=quiet,
+                color=active_color,
+                sleep=sleep,
+                path=braid_path,
+                viewport=viewport,
+            )
+            # show progress at bottom of terminal
+            if bot_print:
+                print("\n")
+                print(
+                    progress_line(
+                        run + 1, runs, start_time, columns - 1, statistics.progress()
+                    )
+                )
+            knot = draw_knot(braid, quiet=True)
+            coords = knot_to_coords(knot)
+            status, analysis = analyze_within_budget(
+                coords, max_crossings=max_crossings, worker=worker, timeout=timeout
+            )
+            row = result_row(
+                status,
+                analysis,
+                braid,
+                run=first_run + run,
+                seed=run_seed,
+                configuration=configuration,
+                loops=loops,
+                moves=t,
+                k_right=k_right,
+                k_above=k_above,
+                weight=likelihood_ratio(braid),
+                inactive=inactive_mask(config),
+            )
+            record(row)
+            # clear screen
+            ret_code = call(clear_cmd)
+            completed += 1
+            if target_ci and statistics.converged(target_ci):
+                break
+        if worker:
+            worker.close()
+    if writer:
+        csvfile.close()
+    if columnar_rows:
+        append_columnar(path, columnar_rows)
+    if summary:
+        results = statistics.summary()
+        results["elapsed"] = time.time() - start_time
+        if stages:
+            results["stages"] = stages
+        with open(summary, "w") as f:
+            json.dump(results, f, indent=2)
+    # clear screen
+    ret_code = call(clear_cmd)
+    # print results
+    print(f"tbkm: {completed} runs completed in {round(time.time()-start_time,1)}s")
+    if target_ci:
+        if statistics.converged(target_ci):
+            print(f"tbkm: converged to ±{target_ci} after {completed} runs")
+        else:
+            print(f"tbkm: not converged to ±{target_ci} after {completed} runs")
+    for knot_type, p in sorted(statistics.proportions().items()):
+        print(f"{knot_type:>8} {p:.4f} ±{statistics.half_width(p):.4f}")
+    if statistics.runs:
+        print(
+            f"crossing number: {statistics.crossing_mean:.2f} (variance {statistics.crossing_variance():.2f})"
+        )
+    if weighted:
+        print(
+            f"effective sample size: {statistics.effective_runs():.1f} of {statistics.runs} analyzed runs"
+        )
+    deferred = completed - statistics.runs
+    if deferred:
+        print(f"tbkm: {deferred} runs were over budget and saved for later analysis")
+    if stages:
+        busy = " ".join(f"{stage} {b:.0%}" for stage, b in stages.items())
+        print(f"tbkm: stages busy {busy} (bottleneck: {max(stages, key=stages.get)})")
+
+    return
+
+
+def enumerate_braids(t, init_config, k_right=0.5, k_above=0.5):
+    """Enumerate every braid that t braid steps can produce from the initial state along with its probability.
+
+    Paths leading to identical braids are merged and paths with zero probability are dropped.
+
+    Keyword arguments:
+    init_config -- initial starting configuration of braid (all rows)
+    k_right -- probability of active end moving to the right (default 0.5)
+    k_above -- probability of active end moving over an adjacent loop (default 0.5)
+    """
+
+    # if ┃ isn't present in the first layer of the init state, we can assume there are multiple rows
+    if "┃" not in init_config:
+        braids = {tuple(init_config): 1.0}
+    else:
+        braids = {(init_config,): 1.0}
+
+    # walk the decision tree one level (braid step) at a time
+    for i in range(t):
+        next_braids = {}
+        for braid, weight in braids.items():
+            prev_state = braid[-1]
+            # the direction is only a choice away from the boundaries
+            right = forced_direction(prev_state)
+            if right is None:
+                directions = ((True, k_right), (False, 1 - k_right))
+            else:
+                directions = ((right, 1.0),)
+            for right, p_right in directions:
+                for above, p_above in ((True, k_above), (False, 1 - k_above)):
+                    p = weight * p_right * p_above
+                    if p > 0:
+                        step = braid + braid_move(prev_state, right, above)
+                        next_braids[step] = next_braids.get(step, 0) + p
+        braids = next_braids
+
+    return braids
+
+
+def exact_model(t, init_config, k_right=0.5, k_above=0.5, quiet=False, path=False):
+    """Compute the exact knot type distribution by analyzing every possible braid once.
+
+    Only practical for few loops and moves since the number of braids grows as 4^t.
+
+    Keyword arguments:
+    init_config -- initial starting configuration of braid (all rows)
+    k_right -- probability of active end moving to the right (default 0.5)
+    k_above -- probability of active end moving over an adjacent loop (default 0.5)
+    quiet -- suppress output (default False)
+    path -- csv file in which you want to save the knot type distribution (default False)
+    """
+
+    # record start time
+    start_time = time.time()
+
+    braids = enumerate_braids(t, init_config, k_right=k_right, k_above=k_above)
+    if not quiet:
+        print(f"tbkm: analyzing {len(braids)} unique braids")
+
+    # accumulate probability of each normalized alexander polynomial
+    # this keeps unknown knot types with different polynomials apart
+    distribution = {}
+    for braid, weight in braids.items():
+        knot = draw_knot(braid, quiet=True)
+        coords = knot_to_coords(knot)
+        analysis = analyze_coords(coords, path=False, quiet=True)
+        key = (analysis[3], format_alexander(analysis[4]))
+        distribution[key] = distribution.get(key, 0) + weight
+    distribution = sorted(distribution.items(), key=lambda item: -item[1])
+
+    if not quiet:
+        for (knot_type, alexander_poly), probability in distribution:
+            print(f"{knot_type:>8} {probability:.6f} {alexander_poly}")
+        print(
+            f"tbkm: {len(braids)} braids analyzed in {round(time.time()-start_time,1)}s"
+        )
+
+    # to save the data, path should hold name the output file
+    if path:
+        with open(path, "w") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(("knottype", "alexander", "probability"))
+            for (knot_type, alexander_poly), probability in distribution:
+                writer.writerow((knot_type, alexander_poly, probability))
+
+    return distribution
+
+
+def walk_moves(row, k_right=0.5):
+    """Return the moves the active end can make from each position of a braid row.
+
+    Positions are the gaps between loops (0 is left of the first loop) and loops are numbered from 1 (left).
+    Each position maps to a list of (probability, right, target, loop, passed) tuples where target is the position
+    reached, loop the interactable loop crossed above or below and passed the non-interacting loops crossed above on the way.
+
+    Keyword arguments:
+    row -- braid step (forward component) giving the layout of the loops
+    k_right -- probability of active end moving to the right (default 0.5)
+    """
+
+    loops = len(row) // 2
+    active = [i for i in range(1, loops + 1) if row[2 * i - 1] == "│"]
+    inactive = [i for i in range(1, loops + 1) if row[2 * i - 1] == "┆"]
+
+    moves = []
+    for gap in range(loops + 1):
+        # the direction is only a choice away from the boundaries
+        state = list(row)
+        state[state.index("┃")] = " "
+        state[2 * gap] = "┃"
+        right = forced_direction("".join(state))
+        if right is None:
+            directions = ((True, k_right), (False, 1 - k_right))
+        else:
+            directions = ((right, 1.0),)
+        options = []
+        for right, p in directions:
+            if right:
+                loop = min(i for i in active if i > gap)
+                target = loop
+                passed = [i for i in inactive if gap < i < loop]
+            else:
+                loop = max(i for i in active if i <= gap)
+                target = loop - 1
+                passed = [i for i in inactive if loop < i <= gap]
+            options.append((p, right, target, loop, passed))
+        moves.append(options)
+
+    return moves
+
+
+def markov_statistics(t, row, k_right=0.5, k_above=0.5):
+    """Compute exact statistics of t moves of the active end from the transition matrix of its positions.
+
+    Returns a dictionary holding:
+    start and target -- positions (see walk_moves) the active end starts from and the boundary farthest from it
+    occupancy -- expected number of moves made from each position
+    over and under -- expected number of times each loop is crossed above and below
+    writhe -- probability of each writhe of the braid (+1 for each crossing moving right above or left below, -1 otherwise)
+    hitting -- probability of first reaching the target after each move (1 to t)
+    mean_hitting -- expected number of moves to first reach the target with no limit on moves (inf if it may never be reached)
+
+    Keyword arguments:
+    row -- braid step (forward component) the active end starts from
+    k_right -- probability of active end moving to the right (default 0.5)
+    k_above -- probability of active end moving over an adjacent loop (default 0.5)
+    """
+
+    try:
+        import numpy
+    except:
+        print("You must have numpy installed to compute markov statistics!")
+        return
+
+    loops = len(row) // 2
+    gaps = loops + 1
+    start = row.index("┃") // 2
+    moves = walk_moves(row, k_right=k_right)
+
+    # transition matrix and probability of crossing each loop (interactable or passed) from each position
+    transition = numpy.zeros((gaps, gaps))
+    crossed = numpy.zeros((gaps, loops))
+    passed = numpy.zeros((gaps, loops))
+    for gap, options in enumerate(moves):
+        for p, right, target, loop, passed_loops in options:
+            transition[gap, target] += p
+            crossed[gap, loop - 1] += p
+            for i in passed_loops:
+                passed[gap, i - 1] += p
+
+    # the sum of the first t powers of P is the top right block of [[P, I], [0, I]] to the power t
+    identity = numpy.eye(gaps)
+    block = numpy.block([[transition, identity], [numpy.zeros((gaps, gaps)), identity]])
+    visits = numpy.linalg.matrix_power(block, t)[:gaps, gaps:]
+    occupancy = visits[start]
+    over = occupancy @ (k_above * crossed + passed)
+    under = occupancy @ ((1 - k_above) * crossed)
+
+    # the writhe changes by at most the number of loops with each move
+    span = t * loops
+    writhe = numpy.zeros((gaps, 2 * span + 1))
+    writhe[start, span] = 1
+    for i in range(t):
+        next_writhe = numpy.zeros_like(writhe)
+        for gap, options in enumerate(moves):
+            for p, right, target, loop, passed_loops in options:
+                sign = 1 if right else -1
+                for above, p_above in ((True, k_above), (False, 1 - k_above)):
+                    # passed loops are always crossed above
+                    change = sign * (len(passed_loops) + (1 if above else -1))
+                    next_writhe[target] += p * p_above * numpy.roll(writhe[gap], change)
+        writhe = next_writhe
+    writhe = writhe.sum(axis=0)
+
+    # only positions next to an interactable loop are visited repeatedly, the farthest of them is the target
+    visited = sorted({target for options in moves for p, r, target, l, s in options})
+    if start - visited[0] > visited[-1] - start:
+        target = visited[0]
+    else:
+        target = visited[-1]
+    # first passage probabilities, removing the walks which already reached the target
+    hitting = numpy.zeros(t)
+    position = identity[start]
+    for i in range(t):
+        position = position @ transition
+        hitting[i] = position[target]
+        position[target] = 0
+    # positions visited before the target and positions from which the target can be reached
+    others = set()
+    frontier = [start]
+    while frontier:
+        for gap in numpy.flatnonzero(transition[frontier.pop()]):
+            if gap != target and gap not in others:
+                others.add(gap)
+                frontier.append(gap)
+    leading = {target}
+    while True:
+        previous = {gap for gap in range(gaps) if transition[gap, list(leading)].any()}
+        if previous <= leading:
+            break
+        leading |= previous
+    # with one-sided moves (k_right of 0 or 1) the walk can get stuck away from the target
+    if not others <= leading:
+        mean_hitting = math.inf
+    else:
+        # expected first passage times solve (I - Q) h = 1 over the other positions
+        others = sorted(others)
+        times = numpy.linalg.solve(
+            numpy.eye(len(others)) - transition[numpy.ix_(others, others)],
+            numpy.ones(len(others)),
+        )
+        mean_hitting = 1 + transition[start, others] @ times
+
+    return {
+        "start": start,
+        "target": target,
+        "occupancy": occupancy,
+        "over": over,
+        "under": under,
+        "writhe": {w - span: p for w, p in enumerate(writhe) if p > 0},
+        "hitting": hitting,
+        "mean_hitting": mean_hitting,
+    }
+
+
+def distribution_moments(distribution):
+    """Return the mean and standard deviation of a distribution given as (value, probability) pairs."""
+
+    mean = sum(value * p for value, p in distribution)
+    variance = sum((value - mean) ** 2 * p for value, p in distribution)
+
+    return (mean, math.sqrt(variance))
+
+
+def walk_observations(braid, start, target):
+    """Return the statistics of markov_statistics observed in a single generated braid.
+
+    The occupancy, over and under counts are lists, writhe is the writhe of the braid and hitting the move at which
+    the target was first reached (None if it never was).
+
+    Keyword arguments:
+    braid -- tuple or list containing all rows of a generated braid
+    start -- number of rows of the initial configuration
+    target -- position whose first passage is recorded
+    """
+
+    loops = len(braid[-1]) // 2
+    occupancy = [0] * (loops + 1)
+    over = [0] * loops
+    under = [0] * loops
+    writhe = 0
+    hitting = None
+    decisions = braid_decisions(braid, start)
+    for move, (forced, right, above) in enumerate(decisions):
+        prev_state = braid[start - 1 + 2 * move]
+        step = braid[start + 1 + 2 * move]
+        end = prev_state.index("┃")
+        next_end = step.index("┃")
+        occupancy[end // 2] += 1
+        # the interactable loop is next to the new position, passed loops are in between
+        loop = next_end // 2 if right else next_end // 2 + 1
+        if above:
+            over[loop - 1] += 1
+        else:
+            under[loop - 1] += 1
+        sign = 1 if right else -1
+        writhe += sign * (1 if above else -1)
+        for i in range(min(end, next_end) + 1, max(end, next_end), 2):
+            if prev_state[i] == "┆":
+                over[i // 2] += 1
+                writhe += sign
+        if hitting is None and next_end // 2 == target:
+            hitting = move + 1
+
+    return (occupancy, over, under, writhe, hitting)
+
+
+def markov_model(
+    t, init_config, k_right=0.5, k_above=0.5, runs=False, quiet=False, path=False
+):
+    """Report the exact statistics of the active end walk, compared with sampled braids if runs are given.
+
+    Keyword arguments:
+    init_config -- initial starting configuration of braid (all rows)
+    k_right -- probability of active end moving to the right (default 0.5)
+    k_above -- probability of active end moving over an adjacent loop (default 0.5)
+    runs -- number of braids to sample for comparison (default False)
+    quiet -- suppress output (default False)
+    path -- json file in which you want to save the exact statistics (default False)
+    """
+
+    # if ┃ isn't present in the first layer of the init state, we can assume there are multiple rows
+    if "┃" not in init_config:
+        row = init_config[-1]
+        start = len(init_config)
+    else:
+        row = init_config
+        start = 1
+
+    statistics = markov_statistics(t, row, k_right=k_right, k_above=k_above)
+    if statistics is None:
+        return
+
+    # average the same statistics over sampled braids
+    sampled = None
+    if runs:
+        loops = len(row) // 2
+        sampled = {
+            "occupancy": [0] * (loops + 1),
+            "over": [0] * loops,
+            "under": [0] * loops,
+            "writhe": [],
+            "hitting": [0] * t,
+        }
+        for run in range(runs):
+            braid = t_steps(t, init_config, k_right, k_above, quiet=True)
+            observed = walk_observations(braid, start, statistics["target"])
+            for key, values in zip(("occupancy", "over", "under"), observed):
+                for i, value in enumerate(values):
+                    sampled[key][i] += value / runs
+            sampled["writhe"].append(observed[3])
+            if observed[4] is not None:
+                sampled["hitting"][observed[4] - 1] += 1 / runs
+
+    if not quiet:
+        target = statistics["target"]
+        exact_writhe = [(w, p) for w, p in statistics["writhe"].items()]
+        # sampled values are shown next to the exact ones
+        label = "sampled" if runs else ""
+        rows = [("gap", "occupancy", "", label)]
+        for gap, value in enumerate(statistics["occupancy"]):
+            rows.append((gap, value, "", sampled["occupancy"][gap] if runs else ""))
+        rows.append(("loop", "over", "under", label))
+        for loop in range(len(statistics["over"])):
+            if runs:
+                sample = f"{sampled['over'][loop]:.4f}/{sampled['under'][loop]:.4f}"
+            over = statistics["over"][loop]
+            under = statistics["under"][loop]
+            rows.append((loop + 1, over, under, sample if runs else ""))
+        rows.append(("writhe", "mean", "sd", label))
+        mean, sd = distribution_moments(exact_writhe)
+        if runs:
+            sample_mean, sample_sd = distribution_moments(
+                [(w, 1 / runs) for w in sampled["writhe"]]
+            )
+            sample = f"{sample_mean:.4f}/{sample_sd:.4f}"
+        rows.append(("", mean, sd, sample if runs else ""))
+        rows.append((f"gap {target}", "reached", "moves", label))
+        reached = sum(statistics["hitting"])
+        sample = sum(sampled["hitting"]) if runs else ""
+        rows.append(("", reached, statistics["mean_hitting"], sample))
+
+        print(f"tbkm: exact statistics of {t} moves from gap {statistics['start']}")
+        for row in rows:
+            cells = []
+            for value in row:
+                if isinstance(value, float):
+                    cells.append(f"{value:>10.4f}")
+                else:
+                    cells.append(f"{value:>10}")
+            print(" ".join(cells))
+
+    # to save the data, path should hold name the output file
+    if path:
+        data = {
+            "start": statistics["start"],
+            "target": statistics["target"],
+            "occupancy": list(statistics["occupancy"]),
+            "over": list(statistics["over"]),
+            "under": list(statistics["under"]),
+            "writhe": {str(w): p for w, p in statistics["writhe"].items()},
+            "hitting": list(statistics["hitting"]),
+            "mean_hitting": statistics["mean_hitting"],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2, default=float)
+
+    return statistics
+
+
+def sweep_points(grid, **defaults):
+    """Expand a grid specification into the list of parameter points it covers.
+
+    Keyword arguments:
+    grid -- dictionary mapping parameters (configuration, loops, moves, k_right, k_above) to lists of values
+    defaults -- value of each parameter missing from the grid
+    """
+
+    names = ("configuration", "loops", "moves", "k_right", "k_above")
+    values = []
+    for parameter in names:
+        value = grid.get(parameter, defaults[parameter])
+        # single values don't need to be given as a list
+        if not isinstance(value, (list, tuple)):
+            value = [value]
+        values.append(value)
+
+    return [dict(zip(names, point)) for point in itertools.product(*values)]
+
+
+def run_sweep(
+    points,
+    runs,
+    inactive=False,
+    quiet=False,
+    path=False,
+    fmt="csv",
+    seed=None,
+    workers=False,
+    max_crossings=False,
+    timeout=False,
+    summary=False,
+):
+    """Run the model at every point of a parameter sweep on one shared pool of analysis workers.
+
+    Keyword arguments:
+    points -- list of parameter dictionaries (see sweep_points)
+    runs -- number of runs at each point
+    inactive -- non-interacting loops of every configuration, see generate_blank (default False)
+    quiet -- suppress output (default False)
+    path -- csv file or columnar directory in which you want to save the output analysis data (default False)
+    fmt -- format of the output analysis data, csv or columnar (default csv)
+    seed -- seed from which the seed of each run is drawn (default None)
+    workers -- number of analysis worker processes (default False, one per cpu)
+    max_crossings -- skip the analysis of knot diagrams with more crossings (default False)
+    timeout -- time in seconds after which the analysis of a run is killed (default False)
+    summary -- json file in which you want to save the statistics of the runs at each point (default False)
+    """
+
+    # record start time
+    start_time = time.time()
+
+    # initial configurations are generated once for each layout and shared by its points
+    layouts = {}
+    for point in points:
+        layout = (point["configuration"], point["loops"])
+        if layout not in layouts:
+            # check every layout before the first run
+            if generate_blank(layout[1], non_interacting=inactive) is None:
+                raise ValueError(
+                    "inactive loops {} don't fit {} loops".format(inactive, layout[1])
+                )
+            layouts[layout] = configurations[layout[0]](
+                layout[1], non_interacting=inactive
+            )
+
+    seeder = random.Random(seed)
+    total = len(points) * runs
+
+    def generate_jobs():
+        run = 0
+        for point in points:
+            init_config = layouts[(point["configuration"], point["loops"])]
+            mask = inactive_mask(init_config)
+            for i in range(runs):
+                run_seed = seeder.getrandbits(32)
+                random.seed(run_seed)
+                braid = t_steps(
+                    point["moves"],
+                    init_config,
+                    k_right=point["k_right"],
+                    k_above=point["k_above"],
+                    quiet=True,
+                )
+                knot = draw_knot(braid, quiet=True)
+                params = dict(point, run=run, seed=run_seed, inactive=mask)
+                yield ((params, braid), knot, knot_to_coords(knot))
+                run += 1
+
+    first_run = 0
+    if path and fmt == "columnar":
+        first_run = init_columnar(path)
+    writer = False
+    if path and fmt == "csv":
+        csvfile = open(path, "w")
+        writer = csv.writer(csvfile)
+        writer.writerow(sweep_header + csv_header + status_header)
+    columnar_rows = []
+
+    # identical knots (common for few moves) are only analyzed once
+    analyzed = AnalysisCache()
+    completed = 0
+    # statistics of the runs at each point
+    statistics = [RunStatistics() for point in points]
+
+    def record(job, status, analysis):
+        nonlocal completed, columnar_rows
+        params, braid = job
+        # runs are generated point by point
+        point_statistics = statistics[params["run"] // runs]
+        params = dict(params, run=first_run + params["run"])
+        row = result_row(status, analysis, braid, **params)
+        point_statistics.add(
+            row["status"], row["knottype"], row["crossingnum"], row["coefficients"]
+        )
+        if writer:
+            writer.writerow(
+                [row[column] for column in sweep_header + csv_header + status_header]
+            )
+        elif path and fmt == "columnar":
+            columnar_rows.append(row)
+            if len(columnar_rows) >= 1000:
+                append_columnar(path, columnar_rows)
+                columnar_rows = []
+        completed += 1
+        if not quiet:
+            print(
+                f"\rtbkm: {completed}/{total} runs {round(time.time()-start_time,1)}s",
+                end="",
+            )
+
+    pool = [AnalysisWorker() for i in range(workers or cpu_count())]
+    jobs = generate_jobs()
+    dispatch_analyses(
+        pool,
+        lambda idle: next(jobs, False),
+        record,
+        analyzed,
+        max_crossings=max_crossings,
+        timeout=timeout,
+    )
+    for worker in pool:
+        worker.close()
+    if writer:
+        csvfile.close()
+    if columnar_rows:
+        append_columnar(path, columnar_rows)
+    if summary:
+        results = {
+            "elapsed": time.time() - start_time,
+            "points": [
+                {"parameters": point, "statistics": point_statistics.summary()}
+                for point, point_statistics in zip(points, statistics)
+            ],
+        }
+        with open(summary, "w") as f:
+            json.dump(results, f, indent=2)
+    if not quiet:
+        print()
+    print(
+        f"tbkm: {completed} runs at {len(points)} points completed in {round(time.time()-start_time,1)}s"
+    )
+
+    return
+
+
+def check_braid(braid):
+    """Raise a ValueError unless the braid is made of rows of braid characters which can be closed into a knot.
+
+    Keyword arguments:
+    braid -- tuple or list containing all rows of a braid
+    """
+
+    if not braid or not all(isinstance(row, str) for row in braid):
+        raise ValueError("braid must be a list of rows")
+    if len(set(len(row) for row in braid)) > 1:
+        raise ValueError("rows of the braid must have the same width")
+    for row in braid:
+        if set(row) - set(" │┆┃┗┓┛┏━"):
+            raise ValueError("unknown characters in braid row {}".format(repr(row)))
+    if braid[-1].count("┃") != 1:
+        raise ValueError("last row of the braid must hold the active end once")
+
+
+def prepare_job(request, defaults):
+    """Return the braid to analyze for a request of the analysis service.
+
+    Keyword arguments:
+    request -- dictionary holding either a braid (list of rows or string with one row per line)
+               or the parameters to generate one (configuration, loops, moves, k_right, k_above, inactive, seed)
+    defaults -- parameters of generated braids which are missing from the request
+    """
+
+    if "braid" in request:
+        braid = request["braid"]
+        if isinstance(braid, str):
+            braid = braid.strip("\n").split("\n")
+        braid = tuple(braid)
+        check_braid(braid)
+        return braid
+
+    params = dict(defaults)
+    params.update(request)
+    if params["configuration"] not in configurations:
+        raise ValueError("unknown configuration {}".format(params["configuration"]))
+    # generation shares the random module between connections
+    with generation_lock:
+        # stdout may carry the results, so the reason the inactive loops are invalid goes to stderr
+        with redirect_stdout(sys.stderr):
+            blank = generate_blank(params["loops"], non_interacting=params["inactive"])
+        if blank is None:
+            raise ValueError(
+                "inactive loops {} don't fit {} loops".format(
+                    params["inactive"], params["loops"]
+                )
+            )
+        if "seed" in params:
+            random.seed(params["seed"])
+        init_config = configurations[params["configuration"]](
+            params["loops"], non_interacting=params["inactive"]
+        )
+        return t_steps(
+            params["moves"],
+            init_config,
+            k_right=params["k_right"],
+            k_above=params["k_above"],
+            quiet=True,
+        )
+
+
+def serve(
+    defaults,
+    socket_path=False,
+    workers=False,
+    queue_size=64,
+    max_crossings=False,
+    timeout=False,
+):
+    """Run a long-lived analysis service with a warm pool of analysis workers.
+
+    Jobs are read as json lines (see prepare_job, with an optional id) from stdin or from the connections
+    to a unix socket and their results are written back as json lines with the same id, in the order
+    they are completed.
+    Reading stops while queue_size jobs are waiting for a worker.
+
+    Keyword arguments:
+    defaults -- parameters of generated braids which are missing from a job (see prepare_job)
+    socket_path -- path of a unix socket to listen on instead of stdin (default False)
+    workers -- number of analysis worker processes (default False, one per cpu)
+    queue_size -- number of jobs which can wait for a worker (default 64)
+    max_crossings -- skip the analysis of knot diagrams with more crossings (default False)
+    timeout -- time in seconds after which the analysis of a job is killed (default False)
+    """
+
+    pool = [AnalysisWorker() for i in range(workers or cpu_count())]
+    jobs = queue.Queue(maxsize=queue_size)
+
+    def replier(f):
+        # several threads write to the same output
+        lock = threading.Lock()
+
+        def reply(result):
+            with lock:
+                try:
+                    f.write(json.dumps(result) + "\n")
+                    f.flush()
+                except (OSError, ValueError):
+                    # the client went away
+                    pass
+
+        return reply
+
+    def read_jobs(lines, reply):
+        for line in lines:
+            if not line.strip():
+                continue
+            request = {}
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("job must be a json object")
+                braid = prepare_job(request, defaults)
+                knot = draw_knot(braid, quiet=True)
+                coords = knot_to_coords(knot)
+            except Exception as e:
+                job_id = request.get("id") if isinstance(request, dict) else None
+                reply({"id": job_id, "status": "error", "message": str(e)})
+                continue
+            # waits while the queue is full
+            jobs.put((reply, request, braid, knot, coords))
+
+    if socket_path:
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(socket_path)
+        server.listen()
+
+        def handle(conn):
+            with conn, conn.makefile("r") as lines, conn.makefile("w") as f:
+                read_jobs(lines, replier(f))
+
+        def accept():
+            while True:
+                conn, address = server.accept()
+                threading.Thread(target=handle, args=(conn,), daemon=True).start()
+
+        threading.Thread(target=accept, daemon=True).start()
+    else:
+
+        def read_stdin():
+            # new workers close sys.stdin when they start, which waits for any read of it to finish
+            with open(sys.stdin.fileno(), closefd=False) as lines:
+                read_jobs(lines, replier(sys.stdout))
+            # no more jobs
+            jobs.put(None)
+
+        threading.Thread(target=read_stdin, daemon=True).start()
+
+    def next_job(idle):
+        # only wait for a job while no worker is busy
+        try:
+            job = jobs.get(block=idle, timeout=0.5 if idle else None)
+        except queue.Empty:
+            return None
+        if job is None:
+            return False
+        return (job, job[3], job[4])
+
+    def finish(job, status, analysis):
+        reply, request, braid, knot, coords = job
+        if status == "ok":
+            result = dict(zip(csv_header, analysis))
+            result["coefficients"] = list(analysis[4])
+        else:
+            result = {}
+        result["id"] = request.get("id")
+        result["status"] = status
+        # return generated braids with their results
+        if "braid" not in request:
+            result["braid"] = list(braid)
+        reply(result)
+
+    # identical knots are only analyzed once
+    analyzed = AnalysisCache()
+    try:
+        dispatch_analyses(
+            pool,
+            next_job,
+            finish,
+            analyzed,
+            max_crossings=max_crossings,
+            timeout=timeout,
+        )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for worker in pool:
+            worker.process.kill()
+        if socket_path:
+            server.close()
+            remove(socket_path)
+
+    return
+
+
+# parse commandline input
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="generate (and analyze) knots with a terminal braid knotting model"
+    )
+    parser.add_argument(
+        "configuration",
+        choices=["raymer", "peppino", "twist"],
+        help="select the initial configuration of coil and its terminal end",
+    )
+    parser.add_argument(
+        "select",
+        choices=[
+            "braid",
+            "knot",
+            "analyze",
+            "model",
+            "exact",
+            "markov",
+            "sweep",
+            "serve",
+        ],
+        help="generate single braid, braid + closed knot, braid + closed knot + analysis, perform multiple runs, analyze every possible braid, compute exact statistics of the active end, perform multiple runs over a grid of parameters or analyze jobs as a service",
+    )
+
+    parser.add_argument(
+        "-l", "--loops", type=int, help="<required> number of loops", required=True
+    )
+    parser.add_argument(
+        "-i",
+        "--inactive",
+        type=int,
+        help="number of random loops which are inaccessible to the terminal end (it will always pass over them)",
+    )
+    parser.add_argument(
+        "-I",
+        "--spec_inactive",
+        nargs="*",
+        type=int,
+        help="specific loops (from left) which are inaccessible to the terminal end (it will always pass over them)",
+    )
+
+    parser.add_argument(
+        "-r",
+        "--right",
+        default=0.5,
+        type=float,
+        help="probability of terminal end moving right (default 0.5)",
+    )
+    parser.add_argument(
+        "-a",
+        "--above",
+        default=0.5,
+        type=float,
+        help="probability of terminal end crossing above adjacent loop instead of below (default 0.5)",
+    )
+    parser.add_argument(
         "-m",
         "--moves",
         type=int,
@@ -874,6 +3022,12 @@ if __name__ == "__main__":
         help="delay (in seconds) between each move of the terminal end",
         default=False,
     )
+    parser.add_argument(
+        "-v",
+        "--viewport",
+        help="only display the part of the braid(s) or knot which fits in the terminal",
+        action="store_true",
+    )
     parser.add_argument(
         "-p",
         "--path",
@@ -891,6 +3045,86 @@ if __name__ == "__main__":
         help="save individual braid files produced during analysis",
         action="store_true",
     )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["csv", "columnar"],
+        help="format of the analysis data saved by the model (default csv)",
+        default="csv",
+    )
+    parser.add_argument(
+        "--max_crossings",
+        type=int,
+        help="skip the analysis of knots whose diagram has more crossings (the braid is saved instead)",
+        default=False,
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="time (in seconds) after which the analysis of a knot is stopped (the braid is saved instead)",
+        default=False,
+    )
+    parser.add_argument(
+        "--target_ci",
+        type=float,
+        help="stop the model once the 95%% confidence interval half-width of every knot type proportion is under this value (-n is the maximum number of runs)",
+        default=False,
+    )
+    parser.add_argument(
+        "--bias_right",
+        type=float,
+        help="sample the model with this probability of moving right and reweight the results to the probability given by -r",
+        default=None,
+    )
+    parser.add_argument(
+        "--bias_above",
+        type=float,
+        help="sample the model with this probability of crossing above and reweight the results to the probability given by -a",
+        default=None,
+    )
+    parser.add_argument(
+        "--resample_inactive",
+        help="select new random inactive loops (-i) for every run of the model",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--summary",
+        type=str,
+        help="json file in which to save the statistics of all runs of the model (of each point of a sweep)",
+        default=False,
+    )
+    parser.add_argument(
+        "-g",
+        "--grid",
+        type=str,
+        help="json file mapping parameters of a sweep (configuration, loops, moves, k_right, k_above) to lists of values, missing parameters are taken from the other arguments",
+        default=False,
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        help="number of analysis processes used by a sweep or the service (default one per cpu), or by a model run as a pipeline",
+        default=False,
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        help="path of a unix socket on which the service listens for jobs (default stdin)",
+        default=False,
+    )
+    parser.add_argument(
+        "--queue_size",
+        type=int,
+        help="number of jobs which can wait for an analysis process in the service or a pipelined model (default 64)",
+        default=64,
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="seed from which the seed of each run in the model is drawn",
+        default=None,
+    )
 
     args = parser.parse_args()
 
@@ -899,10 +3133,16 @@ if __name__ == "__main__":
         raise ValueError("the rate of crossing to the right must be between 0 and 1")
     if args.above < 0 or args.above > 1:
         raise ValueError("the rate of crossing above must be between 0 and 1")
+    for bias in (args.bias_right, args.bias_above):
+        if bias is not None and (bias < 0 or bias > 1):
+            raise ValueError("the biased rates must be between 0 and 1")
 
     # check that number of runs has been specified with the model
-    if args.select == "model" and not args.runs:
+    if args.select in ("model", "sweep") and not args.runs:
         raise ValueError("specify number of runs to perform with the model")
+    # check that the sweep has a grid
+    if args.select == "sweep" and not args.grid:
+        raise ValueError("specify the grid of parameters to sweep")
 
     # pick random color if not using model
     if args.select != "model" and args.color == "random":
@@ -918,6 +3158,17 @@ if __name__ == "__main__":
             inactive = args.spec_inactive
     else:
         inactive = args.inactive
+    # loops selected for each run are applied to a configuration without any
+    resampled = False
+    if args.resample_inactive:
+        if args.select != "model":
+            raise ValueError("inactive loops can only be resampled by the model")
+        if not args.inactive:
+            raise ValueError(
+                "specify the number of inactive loops to resample for every run with -i"
+            )
+        resampled = args.inactive
+        inactive = False
 
     # generate the initial configuration
     if args.configuration == "raymer":
@@ -927,27 +3178,8 @@ if __name__ == "__main__":
     elif args.configuration == "twist":
         init_config = generate_twist(args.loops, non_interacting=inactive)
 
-    # braid
-    braid = t_steps(
-        args.moves,
-        init_config,
-        k_right=args.right,
-        k_above=args.above,
-        quiet=args.quiet,
-        color=color,
-        sleep=args.delay,
-        path=args.path,
-    )
-    # knot
-    if args.select == "knot":
-        knot = draw_knot(braid, quiet=args.quiet)
-    # analyze
-    elif args.select == "analyze":
-        knot = draw_knot(braid, quiet=args.quiet)
-        coords = knot_to_coords(knot)
-        analysis = analyze_coords(coords, path=False, quiet=args.quiet)
     # model
-    elif args.select == "model":
+    if args.select == "model":
         run_model(
             args.runs,
             args.moves,
@@ -959,5 +3191,105 @@ if __name__ == "__main__":
             sleep=args.delay,
             save_braids=args.save_braids,
             path=args.path,
+            fmt=args.format,
+            seed=args.seed,
+            max_crossings=args.max_crossings,
+            timeout=args.timeout,
+            target_ci=args.target_ci,
+            summary=args.summary,
+            bias_right=args.bias_right,
+            bias_above=args.bias_above,
+            viewport=args.viewport,
+            inactive=resampled,
+            workers=args.workers,
+            queue_size=args.queue_size,
         )
-
+    # sweep
+    elif args.select == "sweep":
+        with open(args.grid) as f:
+            grid = json.load(f)
+        points = sweep_points(
+            grid,
+            configuration=args.configuration,
+            loops=args.loops,
+            moves=args.moves,
+            k_right=args.right,
+            k_above=args.above,
+        )
+        run_sweep(
+            points,
+            args.runs,
+            inactive=inactive,
+            quiet=args.quiet,
+            path=args.path,
+            fmt=args.format,
+            seed=args.seed,
+            workers=args.workers,
+            max_crossings=args.max_crossings,
+            timeout=args.timeout,
+            summary=args.summary,
+        )
+    # markov
+    elif args.select == "markov":
+        if args.seed is not None:
+            random.seed(args.seed)
+        markov_model(
+            args.moves,
+            init_config,
+            k_right=args.right,
+            k_above=args.above,
+            runs=args.runs,
+            quiet=args.quiet,
+            path=args.path,
+        )
+    # serve
+    elif args.select == "serve":
+        # the parameters given here are the defaults of the jobs
+        defaults = {
+            "configuration": args.configuration,
+            "loops": args.loops,
+            "moves": args.moves,
+            "k_right": args.right,
+            "k_above": args.above,
+            "inactive": inactive,
+        }
+        serve(
+            defaults,
+            socket_path=args.socket,
+            workers=args.workers,
+            queue_size=args.queue_size,
+            max_crossings=args.max_crossings,
+            timeout=args.timeout,
+        )
+    # exact
+    elif args.select == "exact":
+        exact_model(
+            args.moves,
+            init_config,
+            k_right=args.right,
+            k_above=args.above,
+            quiet=args.quiet,
+            path=args.path,
+        )
+    else:
+        viewport = Viewport() if args.viewport else None
+        # braid
+        braid = t_steps(
+            args.moves,
+            init_config,
+            k_right=args.right,
+            k_above=args.above,
+            quiet=args.quiet,
+            color=color,
+            sleep=args.delay,
+            path=args.path,
+            viewport=viewport,
+        )
+        # knot
+        if args.select == "knot":
+            knot = draw_knot(braid, quiet=args.quiet, viewport=viewport)
+        # analyze
+        elif args.select == "analyze":
+            knot = draw_knot(braid, quiet=args.quiet, viewport=viewport)
+            coords = knot_to_coords(knot)
+            analysis = analyze_coords(coords, path=False, quiet=args.quiet)